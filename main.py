@@ -87,13 +87,13 @@ def main():
     msg = 'Использовать простые примеры [y] или zdf [n]? y/n '
     positive = 'y', 'yes'
     valid = (*positive, 'n', 'no')
-    while (user_input := input(msg).lower()) and user_input not in valid:
-        pass
+    while True:
+        while (user_input := input(msg).lower()) and user_input not in valid:
+            pass
 
-    if user_input in positive:
-        simple_example()
-    else:
-        main()
+        if user_input in positive:
+            simple_example()
+            break
 
 
 if __name__ == '__main__':
@@ -1,10 +1,11 @@
 """Модуль для работы с примером"""
 
-import math
+from functools import lru_cache
 from pathlib import Path
-from statistics import mean, stdev
 from typing import TypeAlias
 
+import numpy as np
+
 
 Number: TypeAlias = int | float
 Size: TypeAlias = tuple[Number, Number]
@@ -13,10 +14,26 @@ ListSize: TypeAlias = list[Size]
 
 class Problem:
     """Экземпляр задачи упаковки"""
+    __slots__ = (
+        'name', '_size', '_lengths', '_widths', '_rectangles',
+        '_bin_area', '_bin_aspect_ratio', '_spec', '_presorted'
+    )
+
     def __init__(self, size: Size, rectangles: ListSize, name='') -> None:
         self.name = name
         self._size = size
-        self._rectangles = rectangles
+        number = len(rectangles)
+        self._lengths = np.fromiter(
+            (rect[0] for rect in rectangles), dtype=np.int64, count=number
+        )
+        self._widths = np.fromiter(
+            (rect[1] for rect in rectangles), dtype=np.int64, count=number
+        )
+        self._rectangles = None
+        self._bin_area = size[0] * size[1]
+        self._bin_aspect_ratio = max(size) / min(size)
+        self._spec = None
+        self._presorted = {}
 
     def to_dict(self) -> dict[str, str | Number | ListSize]:
         """Преобразование в словарь
@@ -28,7 +45,7 @@ class Problem:
             'name': self.name,
             'bin_length': self._size[0],
             'bin_width': self._size[1],
-            'rectangles': self._rectangles
+            'rectangles': self.rectangles
         }
 
     def save(self, path: str='') -> None:
@@ -43,40 +60,112 @@ class Problem:
             abs_path = Path.cwd() / f'./datasets/{self.name}.txt'
         else:
             raise ValueError('File path or problem name not specified')
-        save(self._rectangles, *self._size, abs_path)
+        save(self.rectangles, *self._size, abs_path)
 
     @classmethod
+    @lru_cache(maxsize=None)
     def read(cls, path: str) -> 'Problem':
         """Загрузка примера из txt файла
 
+        Результат запоминается по пути до файла, поэтому повторные
+        чтения одного примера в исследовательских прогонах не требуют
+        разбора файла заново.
+
         :return: Экземпляр класса примера
         :rtype: Problem
         """
         length, width, rectangles = read(path)
         return cls((length, width), rectangles, name=str(path))
 
+    def presorted(self, sorting: str='area') -> 'np.ndarray':
+        """Индексы прямоугольников по невозрастанию параметра сортировки
+
+        Перестановка вычисляется один раз и кешируется, поэтому прогоны
+        алгоритма с одним и тем же параметром сортировки не сортируют
+        набор заново.
+
+        :param sorting: Параметр сортировки, возможны варианты:
+                        `'length'`, `'width'`, `'area'`, `'diagonal'`,
+                        defaults to `'area'`
+        :type sorting: str, optional
+        :return: Массив индексов в отсортированном порядке
+        :rtype: np.ndarray
+        :raises ValueError: В случае, если аргумент `sorting` имеет
+                            значение, отличное от указанных.
+        """
+        if sorting not in ('length', 'width', 'area', 'diagonal'):
+            raise ValueError('Rectangles can only be sorted by length, '
+                             f'width, area, or diagonal but {sorting} '
+                             'was given.')
+        if sorting not in self._presorted:
+            if sorting == 'length':
+                key = self._lengths
+            elif sorting == 'width':
+                key = self._widths
+            elif sorting == 'area':
+                key = self._lengths * self._widths
+            else:
+                key = self._lengths ** 2 + self._widths ** 2
+            self._presorted[sorting] = np.argsort(-key, kind='stable')
+        return self._presorted[sorting]
+
+    def spec(self) -> tuple[dict[str, Number], dict[str, Number]]:
+        """Все характеристики примера за один проход
+
+        Размеры прямоугольников обходятся один раз, а все характеристики
+        выводятся из общих массивов. Результат запоминается, поэтому
+        повторные обращения не требуют пересчета.
+
+        :return: Словари характеристик площади и пропорций
+        :rtype: tuple[dict[str, Number], dict[str, Number]]
+        """
+        if self._spec is not None:
+            return self._spec
+
+        lengths, widths = self._lengths, self._widths
+        areas = lengths * widths
+        aspect_ratio = (
+            np.maximum(lengths, widths) / np.minimum(lengths, widths)
+        )
+        bin_area = self._bin_area
+        bin_aspect_ratio = self._bin_aspect_ratio
+        barea_ratio = areas / bin_area
+        baspect_ratio = bin_aspect_ratio / aspect_ratio
+
+        spec_area = {
+            'area': bin_area,
+            'max_area': areas.max(),  # Максимальная площадь
+            'min_area': areas.min(),  # Минимальная площадь
+            'mean_area': areas.mean(),  # Средняя площадь
+            'std_area': areas.std(ddof=1),  # Средняя площадь
+            'max_barea_ratio': barea_ratio.max(),
+            'min_barea_ratio': barea_ratio.min(),
+            'mean_barea_ratio': barea_ratio.mean(),
+            'std_barea_ratio': barea_ratio.std(ddof=1),
+            'max_area_ratio': areas.max() / areas.min(),  # максимальное соотношение площадей
+        }
+        spec_proportion = {
+            'bin_aspect_ratio': bin_aspect_ratio,  # Соотношение сторон
+            'max_aspect_ratio': aspect_ratio.max(),  # Максимальное соотношение сторон
+            'min_aspect_ratio': aspect_ratio.min(),  # Минимальное соотношение сторон
+            'mean_aspect_ratio': aspect_ratio.mean(),  # Среднее соотношение сторон
+            'std_aspect_ratio': aspect_ratio.std(ddof=1),
+
+            'max_baspect_ratio': baspect_ratio.max(),
+            'min_baspect_ratio': baspect_ratio.min(),
+            'mean_baspect_ratio': baspect_ratio.mean(),
+            'std_baspect_ratio': baspect_ratio.std(ddof=1),
+        }
+        self._spec = (spec_area, spec_proportion)
+        return self._spec
+
     def spec_area(self) -> dict[str, Number]:
         """Характеристики, связанные с площадью
 
         :return: Словарь с характеристиками
         :rtype: dict[str, Number]
         """
-        areas = [math.prod(size) for size in self._rectangles]
-        barea_ratio = [
-            math.prod(size) / math.prod(self._size) for size in self._rectangles
-        ]
-        return {
-            'area': self._size[0] * self._size[1],
-            'max_area': max(areas),  # Максимальная площадь
-            'min_area': min(areas),  # Минимальная площадь
-            'mean_area': mean(areas),  # Средняя площадь
-            'std_area': stdev(areas),  # Средняя площадь
-            'max_barea_ratio': max(barea_ratio),
-            'min_barea_ratio': min(barea_ratio),
-            'mean_barea_ratio': mean(barea_ratio),
-            'std_barea_ratio': stdev(barea_ratio),
-            'max_area_ratio': max(areas) / min(areas),  # максимальное соотношение площадей
-        }
+        return self.spec()[0]
 
     def spec_proportion(self) -> dict[str, Number]:
         """Характеристики, связанные с пропорциями
@@ -84,26 +173,7 @@ class Problem:
         :return: Словарь с характеристиками
         :rtype: dict[str, Number]
         """
-        aspect_ratio = [
-            max(size) / min(size) for size in self._rectangles
-        ]
-        bin_aspect_ratio = max(self._size) / min(self._size)
-        baspect_ratio = [
-            bin_aspect_ratio / (max(size) / min(size)) for size in self._rectangles
-        ]
-
-        return {
-            'bin_aspect_ratio': bin_aspect_ratio,  # Соотношение сторон
-            'max_aspect_ratio': max(aspect_ratio),  # Максимальное соотношение сторон
-            'min_aspect_ratio': min(aspect_ratio),  # Минимальное соотношение сторон
-            'mean_aspect_ratio': mean(aspect_ratio),  # Среднее соотношение сторон
-            'std_aspect_ratio': stdev(aspect_ratio),
-
-            'max_baspect_ratio': max(baspect_ratio),
-            'min_baspect_ratio': min(baspect_ratio),
-            'mean_baspect_ratio': mean(baspect_ratio),
-            'std_baspect_ratio': stdev(baspect_ratio),
-        }
+        return self.spec()[1]
 
     def print_spec_area(self) -> None:
         """Печать характеристик площади"""
@@ -122,6 +192,10 @@ class Problem:
     @property
     def rectangles(self) -> ListSize:
         """Список размеров прямоугольников"""
+        if self._rectangles is None:
+            self._rectangles = list(
+                zip(self._lengths.tolist(), self._widths.tolist())
+            )
         return self._rectangles
 
     @property
@@ -130,7 +204,7 @@ class Problem:
         return self._size
 
     def __len__(self) -> int:
-        return len(self._rectangles)
+        return len(self._lengths)
 
     def __str__(self) -> str:
         return (
@@ -141,7 +215,7 @@ class Problem:
     def __repr__(self) -> str:
         return (
             f'{self.__class__.__name__}'
-            f'({self._size}, {self._rectangles}, name={self.name})'
+            f'({self._size}, {self.rectangles}, name={self.name})'
         )
 
 
@@ -153,20 +227,12 @@ def read(path: str) -> tuple[Number, Number, ListSize]:
     :return: Длина, ширина контейнера и список размеров прямоугольников
     :rtype: tuple[Number, Number, ListSize]
     """
-    rectangles = []
-    bin_length = bin_width = 0
     with open(path, mode='r', encoding='utf-8') as file:
-        for i, line in enumerate(file):
-            if i == 0:
-                continue
-                # count = int(line)
-            if i == 1:
-                bin_width = int(line)
-            elif i == 2:
-                bin_length = int(line)
-            else:
-                length, width = map(int, line.split())
-                rectangles.append((length, width))
+        count = int(next(file))
+        bin_width = int(next(file))
+        bin_length = int(next(file))
+        arr = np.loadtxt(file, dtype=np.int64, max_rows=count, ndmin=2)
+    rectangles = list(map(tuple, arr.tolist()))
     return bin_length, bin_width, rectangles
 
 
@@ -183,9 +249,7 @@ def save(rectangles: ListSize,
     :param path: Путь до файла
     :type path: str
     """
+    lines = [str(len(rectangles)), str(bin_width), str(bin_length)]
+    lines.extend(f'{rect[0]} {rect[1]}' for rect in rectangles)
     with open(path, mode='w', encoding='utf-8') as file:
-        file.write(f'{len(rectangles)}\n')
-        file.write(f'{bin_width}\n')
-        file.write(f'{bin_length}\n')
-        for rect in rectangles:
-            file.write(f'{rect[0]} {rect[1]}\n')
+        file.write('\n'.join(lines) + '\n')
@@ -0,0 +1,40 @@
+"""Общие настройки и помощники для исследовательских графиков
+
+Настройка matplotlib вынесена сюда, чтобы модули графиков не
+перезаписывали rcParams друг друга при повторных импортах.
+"""
+
+from matplotlib import rcParams
+
+
+_CONFIGURED = False
+
+
+def setup_rcparams() -> None:
+    """Однократная настройка rcParams для графиков
+
+    Повторные вызовы ничего не делают, поэтому любой модуль графиков
+    может вызывать функцию при импорте.
+    """
+    global _CONFIGURED
+    if _CONFIGURED:
+        return
+    # Встроенный mathtext справляется с подписями осей без запуска
+    # LaTeX-подпроцесса на каждую отрисовку текста
+    rcParams['text.usetex'] = False
+    rcParams['font.family'] = 'serif'
+    rcParams['font.sans-serif'] = ['Times New Roman']
+    rcParams['font.size'] = '14'
+    # Повторный вызов rc('text.latex', preamble=...) затирал предыдущий,
+    # поэтому преамбула задается одним присваиванием
+    rcParams['text.latex.preamble'] = '\n'.join([
+        r'\usepackage[utf8]{inputenc}',
+        r'\usepackage[russian]{babel}',
+    ])
+    _CONFIGURED = True
+
+
+def remove_border(axis) -> None:
+    """Удаление верхней и правой границы"""
+    axis.spines['top'].set_visible(False)
+    axis.spines['right'].set_visible(False)
@@ -4,32 +4,23 @@
 """
 
 import math
+from concurrent.futures import ThreadPoolExecutor
 from typing import TypeAlias
 from pathlib import Path
-from statistics import mean, stdev, median
 
+import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib import rc, rcParams
+from numba import njit
 from matplotlib.patches import Rectangle
 
 from problem.problem import Problem
+from research._common import remove_border, setup_rcparams
 
 
 Number: TypeAlias = int | float
 
 
-rcParams['text.usetex'] = True
-rcParams['font.family'] = 'serif'
-rcParams['font.sans-serif'] = ['Times New Roman']
-rcParams['font.size'] = '14'
-rc('text.latex', preamble=r'\usepackage[utf8]{inputenc}')
-rc('text.latex', preamble=r'\usepackage[russian]{babel}')
-
-
-def remove_border(axis):
-    """Удаление верхней и правой границы"""
-    axis.spines['top'].set_visible(False)
-    axis.spines['right'].set_visible(False)
+setup_rcparams()
 
 
 def scatter_hist(x, y, ax, ax_hist, axis_mark='y', label='',
@@ -86,12 +77,8 @@ def graph_size_restrictions(length: Number, width: Number,
     max_width = width * height / roll_height
 
     # координаты линии ограничения
-    xs: list[Number] = []
-    start = width
-    while start < max_width:
-        xs.append(start)
-        start += 0.1
-    xs.append(max_width)
+    xs = np.concatenate([np.arange(width, max_width, 0.1), [max_width]])
+    ys = volume / (xs * roll_height)
 
     # границы графика
     x_lim, y_lim = int(3 * width), int(2.5 * length)
@@ -112,7 +99,7 @@ def graph_size_restrictions(length: Number, width: Number,
         y=length, xmin=width, xmax=max_width,
         colors='k', linestyles='dashed', linewidth=1
     )
-    axis.plot(xs, [volume / (x * roll_height) for x in xs], linewidth=1)
+    axis.plot(xs, ys, linewidth=1)
 
     # подписи меток на осях
     axis.set_xticks([0, width, max_width, x_lim])
@@ -130,6 +117,49 @@ def graph_size_restrictions(length: Number, width: Number,
     plt.show()
 
 
+@njit(cache=True, nogil=True)
+def _aspect_ratio_stats(sizes: np.ndarray) -> tuple[float, float, float]:
+    """Статистики соотношения сторон по массиву размеров (N, 2)
+
+    :param sizes: Массив размеров прямоугольников
+    :type sizes: np.ndarray
+    :return: Среднее, стандартное отклонение и медиана соотношений сторон
+    :rtype: tuple[float, float, float]
+    """
+    number = sizes.shape[0]
+    ratio = np.empty(number)
+    for k in range(number):
+        first, second = sizes[k, 0], sizes[k, 1]
+        ratio[k] = first / second if first >= second else second / first
+
+    # Онлайн-вычисление среднего и дисперсии (метод Уэлфорда)
+    mean_ratio = 0.0
+    m2 = 0.0
+    for k in range(number):
+        delta = ratio[k] - mean_ratio
+        mean_ratio += delta / (k + 1)
+        m2 += delta * (ratio[k] - mean_ratio)
+    std_ratio = math.sqrt(m2 / (number - 1))
+
+    return mean_ratio, std_ratio, np.median(ratio)
+
+
+def _zdf_stats(example_path: Path) -> tuple[float, float, float, Number]:
+    """Статистики соотношения сторон одного zdf-примера
+
+    :param example_path: Путь до файла примера
+    :type example_path: Path
+    :return: Среднее, стандартное отклонение, медиана соотношений сторон
+             и площадь контейнера
+    :rtype: tuple[float, float, float, Number]
+    """
+    problem = Problem.read(str(example_path))
+    length, width = problem.size
+    sizes = np.asarray(problem.rectangles, dtype=np.int64)
+    mean_ratio, std_ratio, median_ratio = _aspect_ratio_stats(sizes)
+    return mean_ratio, std_ratio, median_ratio, length * width
+
+
 def graph_aspect_ratio_efficiency():
     efficiency = []
     aspect_ratio_std = []
@@ -139,49 +169,39 @@ def graph_aspect_ratio_efficiency():
     res_file = abs_path / 'results/zdf_area_result.txt'
     zdf_path = abs_path / 'datasets/zdf'
     with res_file.open('r', encoding='utf-8') as file:
-        for i, line in enumerate(file.readlines()):
+        for i, line in enumerate(file):
             if i == 2 or (i - 2) % 4 == 0:
                 efficiency.append(float(line))
             if i == 1 or (i - 1) % 4 == 0:
-                gaps.append(math.prod([int(item) for item in line.split()]))
+                first, second = line.split()
+                gaps.append(int(first) * int(second))
 
-    for i in range(1, 16 + 1):
-        example_path = zdf_path / f'zdf{i}.txt'
+    # Файлы независимы, а чтение и jit-статистики отпускают GIL,
+    # поэтому примеры обрабатываются параллельно в потоках
+    paths = [zdf_path / f'zdf{i}.txt' for i in range(1, 16 + 1)]
+    with ThreadPoolExecutor() as executor:
+        stats = list(executor.map(_zdf_stats, paths))
+
+    for i, (example_path, stat) in enumerate(zip(paths, stats), start=1):
+        mean_ratio, std_ratio, median_ratio, bin_area = stat
         print(f'{example_path = }')
-        aspect_ratio = []
-        length = width = 0
-        with example_path.open('r', encoding='utf-8') as file:
-            for j, line in enumerate(file.readlines()):
-                if j == 1:
-                    length = int(line)
-                elif j == 2:
-                    width = int(line)
-                elif j > 2:
-                    size = [int(item) for item in line.split()]
-                    aspect_ratio.append(max(size) / min(size))
-                    # Площадь
-                    # aspect_ratio.append((length * width) / (size[0] * size[1]))
-                    # aspect_ratio.append((size[0] * size[1]) / (length * width))
-                    # aspect_ratio.append(size[0] * size[1])
-                    # Пропорции
-                    # aspect_ratio.append(
-                    #     (max((length, width)) / min((length, width))) / (max(size) / min(size))
-                    # )
-        gaps[i - 1] = (gaps[i - 1] - (length * width)) / (length * width)
-        aspect_ratio_std.append(stdev(aspect_ratio))
-
-        print(f'zdf{i} mean: {mean(aspect_ratio)}')
-        print(f'zdf{i} median: {median(sorted(aspect_ratio))}')
+        gaps[i - 1] = (gaps[i - 1] - bin_area) / bin_area
+        aspect_ratio_std.append(std_ratio)
+
+        print(f'zdf{i} mean: {mean_ratio}')
+        print(f'zdf{i} median: {median_ratio}')
         print(f'Gap: {gaps[i - 1]}')
         print('-' * 50)
 
-    print(f'Min aspect ratio std: {min(aspect_ratio_std)}')
-    print(f'Max aspect ratio std: {max(aspect_ratio_std)}')
-    print(f'Mean aspect ratio std: {mean(aspect_ratio_std)}')
+    aspect_ratio_std = np.asarray(aspect_ratio_std)
+    gaps = np.asarray(gaps)
+    print(f'Min aspect ratio std: {aspect_ratio_std.min()}')
+    print(f'Max aspect ratio std: {aspect_ratio_std.max()}')
+    print(f'Mean aspect ratio std: {aspect_ratio_std.mean()}')
 
-    print(f'Min gap: {min(gaps)}')
-    print(f'Max gap: {max(gaps)}')
-    print(f'Mean gap: {mean(gaps)}')
+    print(f'Min gap: {gaps.min()}')
+    print(f'Max gap: {gaps.max()}')
+    print(f'Mean gap: {gaps.mean()}')
 
     _, axes = plt.subplots(figsize=(12, 6))
     axes.grid()
@@ -208,7 +228,7 @@ def read_result(path):
     abs_path = Path.cwd()
     res_file = abs_path / path
     with res_file.open('r', encoding='utf-8') as file:
-        for i, line in enumerate(file.readlines()):
+        for i, line in enumerate(file):
             if i == 2 or (i - 2) % 4 == 0:
                 result.append(float(line))
             if i == 1 or (i - 1) % 4 == 0:
@@ -7,19 +7,34 @@
 для ограниченной задачи проката слитка
 """
 
-from operator import attrgetter, itemgetter
+import logging
+
+from collections import defaultdict, deque
 from dataclasses import dataclass
+from operator import attrgetter
 from typing import Literal, TypeAlias
 
+import numpy as np
+
 from .utils import timeit
 from .ph import ph_bpp
 from .types import Number, SizeList, Coord, SoftType
-from .base import Rectangle, min_enclosing_rect, difference_rect
+from .base import Rectangle, difference_rect
 
 
 SortingOptions: TypeAlias = Literal['length', 'width', 'area', 'diagonal']
 RotateOptions: TypeAlias = Literal['length', 'width']
 ListRectangles: TypeAlias = list[Rectangle]
+SizeKey: TypeAlias = tuple[Number, Number, bool]
+
+# таблицы допустимых параметров: проверка и выбор ключа одним поиском
+_SORT_KEYS = {
+    'length': attrgetter('length'),
+    'width': attrgetter('width'),
+    'area': attrgetter('area'),
+    'diagonal': attrgetter('diagonal'),
+}
+_ROTATE_MODES = frozenset(('length', 'width'))
 
 
 @dataclass
@@ -29,10 +44,12 @@ class LocationOption:
     :param size_list: Список пар из размещенного прямоугольника и индекса
     :param min_rect: Минимальный объемлющий прямоугольник
     :param efficiency: Эффективность
+    :param total_area: Суммарная площадь размещенных прямоугольников
     """
     placed: list[tuple[Rectangle, int]]
     min_rect: Rectangle
     efficiency: Number
+    total_area: Number
 
 
 def create_rectangles(size_list: SizeList) -> ListRectangles:
@@ -62,7 +79,18 @@ def sort_rect(rectangles: ListRectangles,
     :return: Отсортированный по невозрастанию список прямоугольников
     :rtype: ListRectangles
     """
-    return sorted(rectangles, key=attrgetter(sorting), reverse=True)
+    key_func = _SORT_KEYS.get(sorting)
+    if key_func is None:
+        raise ValueError(
+            'Rectangles can only be sorted by length, width, area, or '
+            f'diagonal but {sorting} was given.'
+        )
+    keys = np.fromiter(
+        (key_func(rect) for rect in rectangles),
+        dtype=np.float64, count=len(rectangles)
+    )
+    order = np.argsort(-keys, kind='stable')
+    return [rectangles[i] for i in order]
 
 
 def rotate_all(rectangles: ListRectangles, rtype: RotateOptions) -> None:
@@ -97,22 +125,64 @@ def soft_size_type(rect: Rectangle,
     """
     is_right = rect.brp[0] == min_rect.brp[0]
     is_top = rect.trp[1] == min_rect.trp[1]
-    if is_right and is_top:
-        # расширение в любую сторону
-        return 3
-    if is_right and not is_top:
-        # расширение по ширине
-        return 1
-    if not is_right and is_top:
-        # расширение по длине
-        return 2
-    # нельзя расширять
-    return None
+    # бит 0 - свободна правая сторона, бит 1 - верхняя
+    code = int(is_right) | (int(is_top) << 1)
+    return (None, 1, 2, 3)[code]
 
 
-@timeit
-def get_best_fig(rectangles: ListRectangles, indices: list[int], region: Coord,
-                 min_rect: Rectangle) -> tuple[int | None, int, Rectangle | None, list[tuple[Rectangle, int]]]:
+def _size_key(rect: Rectangle) -> SizeKey:
+    """Ключ группы одинаковых размеров
+
+    Зеркальные размеры сливаются в одну группу только для поворотных
+    прямоугольников: их наборы ориентаций совпадают, а нормализация
+    делает ключ устойчивым к развороту на месте в :func:`ph_bpp`.
+    Признак поворота входит в ключ, чтобы неповоротный прямоугольник
+    не считался дубликатом поворотного с иным набором ориентаций.
+
+    :param rect: Прямоугольник
+    :type rect: Rectangle
+    :return: Размер и признак поворота
+    :rtype: SizeKey
+    """
+    length, width = rect.size
+    if rect.is_rotatable and width > length:
+        length, width = width, length
+    return length, width, rect.is_rotatable
+
+
+def _place_first(rectangles: 'np.ndarray', indices: 'np.ndarray',
+                 region: Coord, min_rect: Rectangle) -> tuple | None:
+    """Размещение первого прямоугольника без полного перебора
+
+    При вырожденном объемлющем прямоугольнике лучший вариант известен
+    сразу: первый кандидат занимает порожденную им область целиком,
+    эффективность равна единице, свободного пространства нет, а при
+    равенстве вариантов исходная ориентация предпочтительнее повернутой.
+
+    :return: Набор параметров размещения в формате :func:`get_best_fig`
+             или `None`, если точка вырожденного прямоугольника лежит
+             вне кандидата и требуется общий перебор.
+    :rtype: tuple | None
+    """
+    index = indices[0]
+    rect = rectangles[index]
+    rect_length, rect_width = rect.size
+    region_x, region_y = region
+    mr_x, mr_y = min_rect.x, min_rect.y
+    if not (region_x <= mr_x <= region_x + rect_width
+            and region_y <= mr_y <= region_y + rect_length):
+        return None
+    best_rect = Rectangle(
+        rect_length, rect_width, region, rect.is_rotatable, rect.name
+    )
+    new_min_rect = Rectangle(rect_length, rect_width, coord=region)
+    return index, 0, new_min_rect, [(best_rect, index)], 1.0, best_rect.area
+
+
+def get_best_fig(rectangles: 'np.ndarray', indices: 'np.ndarray',
+                 region: Coord, min_rect: Rectangle,
+                 size_groups: dict[SizeKey, deque[int]],
+                 group_keys: list[SizeKey]) -> tuple[int | None, int, Rectangle | None, list[tuple[Rectangle, int]], Number, Number]:
     """Выбор лучшего варианта размещения
 
     Выбор осуществляется на основе вычисления свободного прямоугольника
@@ -130,78 +200,109 @@ def get_best_fig(rectangles: ListRectangles, indices: list[int], region: Coord,
              - нового объемлющего прямоугольника
              - набора пар (прямоугольник, индекс) упаковки свободного
              пространства, включает прямоугольник, породивший упаковку
-    :rtype: tuple[int | None, int, Rectangle | None, list[tuple[Rectangle, int]]]
+             - эффективности лучшего варианта
+             - суммарной площади размещенных прямоугольников
+    :rtype: tuple[int | None, int, Rectangle | None, list[tuple[Rectangle, int]], Number, Number]
     """
+    if min_rect.area == 0 and len(indices):
+        placement = _place_first(rectangles, indices, region, min_rect)
+        if placement is not None:
+            return placement
     best, orientation, max_ef, max_area, res_min_rect = None, 0, 0, 0, None
     best_res = []
-    viewed = set()
+    best_total = 0
+    # границы текущего объемлющего прямоугольника и региона не меняются
+    region_x, region_y = region
+    mr_x, mr_y = min_rect.x, min_rect.y
+    mr_tx, mr_ty = min_rect.trp
     for index in indices:
         is_first = min_rect.area == 0
         rect = rectangles[index]
-        size = (rect.length, rect.width)
-        if size not in viewed:
-            viewed.add(size)
-        else:
+        if size_groups[group_keys[index]][0] != index:
+            # дубликат размера: рассматривается только первый оставшийся
             continue
-        rotate_variants = []
+        best_variant = None
         # k = 0
-        for j in range(1 + rect.is_rotatable):
-            rect_length = rect.size[(0 + j) % 2]
-            rect_width = rect.size[(1 + j) % 2]
-
-            new_min_rect = min_enclosing_rect(
-                [Rectangle(rect_length, rect_width, region), min_rect]
-            )
-            best_rect = rectangles[index].copy()
-            if j == 1:
-                best_rect.rotate()
-            best_rect.coord = region
-            if new_min_rect.area <= max_area and max_ef == 1:
+        size_l, size_w = rect.size
+        # пары сторон подготовлены заранее, без модульной арифметики;
+        # квадрат не порождает второй ориентации
+        if rect.is_rotatable and size_l != size_w:
+            orientations = ((size_l, size_w), (size_w, size_l))
+        else:
+            orientations = ((size_l, size_w),)
+        for j, (rect_length, rect_width) in enumerate(orientations):
+
+            # объемлющий прямоугольник кандидата скалярными min/max
+            cand_tx = region_x + rect_width
+            cand_ty = region_y + rect_length
+            blp_x = mr_x if mr_x < region_x else region_x
+            blp_y = mr_y if mr_y < region_y else region_y
+            trp_x = mr_tx if mr_tx > cand_tx else cand_tx
+            trp_y = mr_ty if mr_ty > cand_ty else cand_ty
+            if (trp_y - blp_y) * (trp_x - blp_x) <= max_area and max_ef == 1:
                 continue
+            new_min_rect = Rectangle(
+                trp_y - blp_y, trp_x - blp_x, coord=(blp_x, blp_y)
+            )
+            best_rect = Rectangle(
+                rect_length, rect_width, region, rect.is_rotatable, rect.name
+            )
             empty = difference_rect(new_min_rect, [min_rect, best_rect])
-            best_idx = indices.index(index)
-            remainder = indices[:best_idx] + indices[best_idx + 1:]
+            remainder = indices[indices != index]
             soft_type = None
             # if empty:
             #     soft_type = soft_size_type(empty[0], min_rect)
             res = additional_packaging(empty, rectangles, remainder, soft_type)
             res.append((best_rect, index))
-            max_length = max([item.tlp[1] for item, _ in res])
-            max_width = max([item.brp[0] for item, _ in res])
+            # один проход вместо трех списковых включений
+            max_length = max_width = area = 0
+            for item, _ in res:
+                item_tlp_y = item.coord[1] + item.length
+                item_brp_x = item.coord[0] + item.width
+                if item_tlp_y > max_length:
+                    max_length = item_tlp_y
+                if item_brp_x > max_width:
+                    max_width = item_brp_x
+                area += item.length * item.width
             if max_length > new_min_rect.length:
                 new_min_rect.length = max_length
             if max_width > new_min_rect.width:
                 new_min_rect.width = max_width
 
-            area = sum([r.area for r, _ in res])
             efficiency = (area + min_rect.area) / new_min_rect.area
 
-            rotate_variants.append(
-                (efficiency, new_min_rect.area, j, index, new_min_rect, res)
-            )
-        if rotate_variants:
-            if best is None:
-                max_ef, max_area, orientation, best, res_min_rect, best_res = max(
-                    rotate_variants, key=itemgetter(0, 1)
-                )
-            else:
-                candidate_ef, candidate_area, candidate_or, candidate, candidate_min_rect, candidate_res = max(
-                    rotate_variants, key=itemgetter(0, 1)
+            if (best_variant is None
+                    or (efficiency, new_min_rect.area)
+                    > (best_variant[0], best_variant[1])):
+                best_variant = (
+                    efficiency, new_min_rect.area, j, index,
+                    new_min_rect, res, area
                 )
-                if len(indices) == len(best_res) > len(candidate_res):
-                    continue
-                if (candidate_ef, candidate_area) > (max_ef, max_area):
-                    orientation = candidate_or
-                    max_ef, best = candidate_ef, candidate
-                    max_area = candidate_area
-                    res_min_rect = candidate_min_rect
-                    best_res = candidate_res
+        if best_variant is not None:
+            (candidate_ef, candidate_area, candidate_or, candidate,
+             candidate_min_rect, candidate_res, candidate_total) = best_variant
+            if best is not None and len(indices) == len(best_res) > len(candidate_res):
+                continue
+            if best is None or (candidate_ef, candidate_area) > (max_ef, max_area):
+                orientation = candidate_or
+                max_ef, best = candidate_ef, candidate
+                max_area = candidate_area
+                res_min_rect = candidate_min_rect
+                best_res = candidate_res
+                best_total = candidate_total
         if is_first:
             break
-    return best, orientation, res_min_rect, best_res
+    return best, orientation, res_min_rect, best_res, max_ef, best_total
+
 
+# кеш подзадач доупаковки: многие кандидаты порождают одинаковые
+# свободные области с одинаковыми наборами размеров
+_PACKAGING_CACHE: dict = {}
+_PACKAGING_CACHE_SIZE = 4096
 
-def additional_packaging(min_rect, rectangles, indices: list[int], soft_type):
+
+def additional_packaging(min_rect, rectangles: 'np.ndarray',
+                         indices: 'np.ndarray', soft_type):
     """Доупаковка свободного пространства"""
     result = []
     if min_rect:
@@ -209,31 +310,63 @@ def additional_packaging(min_rect, rectangles, indices: list[int], soft_type):
             min_rect = min_rect[0]
         else:
             raise ValueError('Что-то пошло не так!')
-        res = ph_bpp(
-            min_rect.length, min_rect.width, [rectangles[i] for i in indices],
-            start=min_rect.blp, soft_type=soft_type, excess=0.2
+        # выборка подмножества одной операцией вместо цикла
+        subset = rectangles[indices]
+        # ph_bpp первым делом приводит каждый прямоугольник к виду
+        # длина >= ширина, поэтому нормализация выполняется заранее:
+        # и ключ кеша, и побочный эффект совпадают с прямым вызовом
+        sizes = []
+        for rect in subset:
+            if rect.width > rect.length:
+                rect.length, rect.width = rect.width, rect.length
+            sizes.append((rect.length, rect.width, rect.is_rotatable))
+        key = (
+            min_rect.length, min_rect.width, min_rect.blp,
+            soft_type, tuple(sizes)
         )
-        for i, item in res:
-            result.append((item, indices[i]))
+        cached = _PACKAGING_CACHE.get(key)
+        if cached is None:
+            res = ph_bpp(
+                min_rect.length, min_rect.width, subset,
+                start=min_rect.blp, soft_type=soft_type, excess=0.2
+            )
+            if len(_PACKAGING_CACHE) >= _PACKAGING_CACHE_SIZE:
+                _PACKAGING_CACHE.clear()
+            cached = tuple((i, item.copy()) for i, item in res)
+            _PACKAGING_CACHE[key] = cached
+        for i, item in cached:
+            result.append((item.copy(), indices[i]))
     return result
 
 
 @timeit
 def algorithm_wl(rectangles, sorting='length', rtype='width'):
     # без ограничений
-    if sorting not in ('length', 'width', 'area', 'diagonal'):
+    if sorting not in _SORT_KEYS:
         raise ValueError(
             'Rectangles can only be sorted by length, width, area, or '
             f'diagonal but {sorting} was given.'
         )
-    if rtype not in ('width', 'length'):
+    if rtype not in _ROTATE_MODES:
         raise ValueError(
             'Long side of rectangle can be length or width '
             f'but {rtype} was given.'
         )
     # rotate_all(rectangles, rtype)
     rectangles = sort_rect(rectangles, sorting)
-    indices = list(range(len(rectangles)))
+    # массив объектов для выборки подмножеств без Python-циклов
+    rect_array = np.array(rectangles, dtype=object)
+    # маска неразмещенных прямоугольников
+    alive = np.ones(len(rectangles), dtype=bool)
+    # группировка индексов по размеру для пропуска дубликатов;
+    # ключи запоминаются на момент построения, так как ph_bpp может
+    # развернуть прямоугольник на месте
+    size_groups: dict[SizeKey, deque[int]] = defaultdict(deque)
+    group_keys: list[SizeKey] = []
+    for position, rect in enumerate(rectangles):
+        key = _size_key(rect)
+        group_keys.append(key)
+        size_groups[key].append(position)
 
     start = (0, 0)
     min_rect = Rectangle(0, 0)
@@ -242,54 +375,39 @@ def algorithm_wl(rectangles, sorting='length', rtype='width'):
 
     k = 0
 
-    while indices:
+    while alive.any():
         k += 1
+        indices = np.flatnonzero(alive)
         layouts = []
         for region in regions:
             # выбрать лучшую заготовку
             # считаем объемлющий прямоугольник
-            best, _, new_min_rect, best_res = get_best_fig(
-                rectangles, indices, region, min_rect
+            best, _, new_min_rect, best_res, efficiency, total_area = get_best_fig(
+                rect_array, indices, region, min_rect, size_groups,
+                group_keys
             )
             if best is None or new_min_rect is None:
                 raise ValueError()
-
-            best_rect = best_res[-1][0]
-            max_length = max([item.tlp[1] for item, _ in best_res])
-            max_width = max([item.brp[0] for item, _ in best_res])
-            if max_length > new_min_rect.length:
-                new_min_rect.length = max_length
-            if max_width > new_min_rect.width:
-                new_min_rect.width = max_width
-            # если есть, доупаковываем с мягкими размерами
-            # считаем эффективность этого варианта
-            if min_rect.area == 0:
-                efficiency = best_rect.area / new_min_rect.area
-            else:
-                fig_area = sum([rect.area for rect, _ in best_res])
-                efficiency = (min_rect.area + fig_area) / new_min_rect.area
+            # габариты и эффективность уже посчитаны внутри get_best_fig
             # сохраняем вариант
             layouts.append(
                 LocationOption(
-                    best_res, new_min_rect, efficiency
+                    best_res, new_min_rect, efficiency, total_area
                 )
             )
         # выбираем лучший вариант
-        layout = max(
-            enumerate(layouts),
-            key=lambda item: (item[1].efficiency, sum([r[0].area for r in item[1].placed]))
-        )
-        layout = layout[1]
+        layout = max(layouts, key=attrgetter('efficiency', 'total_area'))
         # обновляем упакованные заготовки
         for rect, src in layout.placed:
             placed.append(rect)
-            indices.remove(src)
+            alive[src] = False
+            size_groups[group_keys[src]].remove(src)
         # обновляем объемлющий прямоугольник
         min_rect = layout.min_rect
         # вычисляем новые регионы
         regions = [min_rect.tlp, min_rect.brp]
         # print(f'Новые регионы: {regions = }')
         # visualize(min_rect.length, min_rect.width, placed)
-        print(f'Шаг {k}: {len(placed)}')
+        logging.debug('Шаг %d: %d', k, len(placed))
 
     return placed, min_rect
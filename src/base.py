@@ -10,7 +10,6 @@ Module contains:
 
 import itertools
 
-from operator import attrgetter
 from typing import Generator, Iterable, Optional, TypeVar
 
 from .types import Number, Coord, Size
@@ -29,6 +28,11 @@ class Rectangle:
     :param _coord: Coordinates of lower-left corner of rectangle
     :type _coord: tuple[int | float, int | float]
     """
+    __slots__ = (
+        '_length', '_width', '_coord', 'is_rotatable', 'name',
+        '_trp', '_brp', '_tlp', '_area', '_diagonal'
+    )
+
     def __init__(self, length: Number, width: Number,
                  coord: Coord | None=None,
                  is_rotatable: bool=True, name='') -> None:
@@ -37,6 +41,19 @@ class Rectangle:
         self._coord = coord if coord else (0, 0)
         self.is_rotatable = is_rotatable
         self.name = name
+        self._trp = None
+        self._brp = None
+        self._tlp = None
+        self._area = None
+        self._diagonal = None
+
+    def _invalidate(self) -> None:
+        """Сброс кешированных углов и площади при изменении размеров"""
+        self._trp = None
+        self._brp = None
+        self._tlp = None
+        self._area = None
+        self._diagonal = None
 
     def rotate(self) -> None:
         """Rotate rectangle 90 degrees"""
@@ -58,14 +75,16 @@ class Rectangle:
                  если пересечения нет.
         :rtype: None | Rectangle
         """
-        x = max(min(self.x, self.trp[0]), min(other.x, other.trp[0]))
-        y = max(min(self.y, self.trp[1]), min(other.y, other.trp[1]))
-        x_top_right_point = min(
-            max(self.x, self.trp[0]), max(other.x, other.trp[0])
-        )
-        y_top_right_point = min(
-            max(self.y, self.trp[1]), max(other.y, other.trp[1])
-        )
+        ax0, ay0 = self._coord
+        ax1 = ax0 + self._width
+        ay1 = ay0 + self._length
+        bx0, by0 = other._coord
+        bx1 = bx0 + other._width
+        by1 = by0 + other._length
+        x = ax0 if ax0 > bx0 else bx0
+        y = ay0 if ay0 > by0 else by0
+        x_top_right_point = ax1 if ax1 < bx1 else bx1
+        y_top_right_point = ay1 if ay1 < by1 else by1
         if x < x_top_right_point and y < y_top_right_point:
             length = y_top_right_point - y
             width = x_top_right_point - x
@@ -96,24 +115,36 @@ class Rectangle:
             yield self
             return
 
-        xs = {self.x, self.trp[0]}
-        ys = {self.y, self.trp[1]}
-
-        if self.x < other.x < self.trp[0]:
-            xs.add(other.x)
-        if self.x < other.trp[0] < self.trp[0]:
-            xs.add(other.trp[0])
-        if self.y < other.y < self.trp[1]:
-            ys.add(other.y)
-        if self.y < other.trp[1] < self.trp[1]:
-            ys.add(other.trp[1])
-
-        for (x, x_trp), (y, y_trp) in itertools.product(pairwise(sorted(xs)),
-                                                        pairwise(sorted(ys))):
-            length, width = y_trp - y, x_trp - x
-            rect = self.__class__(length, width, (x, y))
-            if rect != inter:
-                yield rect
+        ax0, ay0 = self._coord
+        ax1 = ax0 + self._width
+        ay1 = ay0 + self._length
+        bx0, by0 = other._coord
+        bx1 = bx0 + other._width
+        by1 = by0 + other._length
+
+        xs = {ax0, ax1}
+        ys = {ay0, ay1}
+
+        if ax0 < bx0 < ax1:
+            xs.add(bx0)
+        if ax0 < bx1 < ax1:
+            xs.add(bx1)
+        if ay0 < by0 < ay1:
+            ys.add(by0)
+        if ay0 < by1 < ay1:
+            ys.add(by1)
+
+        xs = sorted(xs)
+        ys = sorted(ys)
+        inter_x, inter_y = inter.coord
+        for i in range(len(xs) - 1):
+            x, x_trp = xs[i], xs[i + 1]
+            for j in range(len(ys) - 1):
+                y, y_trp = ys[j], ys[j + 1]
+                if x == inter_x and y == inter_y:
+                    # ячейка сетки, совпадающая с пересечением
+                    continue
+                yield self.__class__(y_trp - y, x_trp - x, (x, y))
 
     @property
     def length(self) -> Number:
@@ -123,6 +154,7 @@ class Rectangle:
     @length.setter
     def length(self, value: Number) -> None:
         self._length = value
+        self._invalidate()
 
     @property
     def width(self) -> Number:
@@ -132,6 +164,7 @@ class Rectangle:
     @width.setter
     def width(self, value: Number) -> None:
         self._width = value
+        self._invalidate()
 
     @property
     def coord(self) -> Coord:
@@ -141,6 +174,7 @@ class Rectangle:
     @coord.setter
     def coord(self, value: Coord) -> None:
         self._coord = value
+        self._invalidate()
 
     @property
     def x(self) -> Number:
@@ -162,7 +196,11 @@ class Rectangle:
           |             |
         coord --- w ----#
         """
-        return (self.coord[0] + self.width, self.coord[1] + self.length)
+        if self._trp is None:
+            self._trp = (
+                self._coord[0] + self._width, self._coord[1] + self._length
+            )
+        return self._trp
 
     @property
     def tlp(self) -> Coord:
@@ -174,7 +212,9 @@ class Rectangle:
           |             |
         coord --- w ----#
         """
-        return (self.coord[0], self.coord[1] + self.length)
+        if self._tlp is None:
+            self._tlp = (self._coord[0], self._coord[1] + self._length)
+        return self._tlp
 
     @property
     def brp(self) -> Coord:
@@ -186,7 +226,9 @@ class Rectangle:
           |             |
         coord --- w -- brp
         """
-        return (self.coord[0] + self.width, self.coord[1])
+        if self._brp is None:
+            self._brp = (self._coord[0] + self._width, self._coord[1])
+        return self._brp
 
     @property
     def blp(self) -> Coord:
@@ -203,12 +245,16 @@ class Rectangle:
     @property
     def area(self) -> Number:
         """Area of a rectangle"""
-        return self.length * self.width
+        if self._area is None:
+            self._area = self._length * self._width
+        return self._area
 
     @property
     def diagonal(self):
         """Diagonal of rectangle"""
-        return (self.length**2 + self.width**2) ** 0.5
+        if self._diagonal is None:
+            self._diagonal = (self._length**2 + self._width**2) ** 0.5
+        return self._diagonal
 
     @property
     def size(self) -> Size:
@@ -244,7 +290,19 @@ class Rectangle:
         return self.__copy__()
 
     def __copy__(self) -> 'Rectangle':
-        return Rectangle(self.length, self.width, self.coord, self.is_rotatable, self.name)
+        # прямое заполнение слотов в обход __init__ и сеттеров
+        clone = object.__new__(Rectangle)
+        clone._length = self._length
+        clone._width = self._width
+        clone._coord = self._coord
+        clone.is_rotatable = self.is_rotatable
+        clone.name = self.name
+        clone._trp = self._trp
+        clone._brp = self._brp
+        clone._tlp = self._tlp
+        clone._area = self._area
+        clone._diagonal = self._diagonal
+        return clone
 
     def __hash__(self) -> int:
         return hash((self._length, self._width, self._coord, self.is_rotatable, self.name))
@@ -261,10 +319,34 @@ def min_enclosing_rect(rectangles: Iterable[Rectangle]) -> Rectangle:
     :return: минимальный объемлющий прямоугольник
     :rtype: Rectangle
     """
-    blp_x = min(map(attrgetter('x'), rectangles))
-    blp_y = min(map(attrgetter('y'), rectangles))
-    trp_x = max(rect.trp[0] for rect in rectangles)
-    trp_y = max(rect.trp[1] for rect in rectangles)
+    rectangles = list(rectangles)
+    if len(rectangles) == 2:
+        # частый случай в get_best_fig: скалярные min/max без обходов
+        first, second = rectangles
+        first_trp, second_trp = first.trp, second.trp
+        blp_x = first.x if first.x < second.x else second.x
+        blp_y = first.y if first.y < second.y else second.y
+        trp_x = first_trp[0] if first_trp[0] > second_trp[0] else second_trp[0]
+        trp_y = first_trp[1] if first_trp[1] > second_trp[1] else second_trp[1]
+        return Rectangle(trp_y - blp_y, trp_x - blp_x, coord=(blp_x, blp_y))
+    # один проход с четырьмя скалярами вместо четырех обходов набора
+    iterator = iter(rectangles)
+    first = next(iterator)
+    blp_x, blp_y = first.coord
+    trp_x = blp_x + first.width
+    trp_y = blp_y + first.length
+    for rect in iterator:
+        x, y = rect.coord
+        top_x = x + rect.width
+        top_y = y + rect.length
+        if x < blp_x:
+            blp_x = x
+        if y < blp_y:
+            blp_y = y
+        if top_x > trp_x:
+            trp_x = top_x
+        if top_y > trp_y:
+            trp_y = top_y
     return Rectangle(trp_y - blp_y, trp_x - blp_x, coord=(blp_x, blp_y))
 
 
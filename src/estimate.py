@@ -1,5 +1,7 @@
 """Модуль оценки доступных размеров"""
 
+import numpy as np
+
 from .types import Number
 
 
@@ -78,3 +80,74 @@ def estimate_size(length: Number, width: Number, height: Number,
         )
 
     return x_estimate, y_estimate
+
+
+def estimate_size_vec(length: Number, width: Number, height: Number,
+                      roll_height: Number, xs: np.ndarray,
+                      ys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Векторная оценка доступных размеров для набора точек
+
+    Эквивалентна поэлементному вызову :func:`estimate_size`, но области
+    выбираются по битовой маске, а все выражения считаются массивами за
+    один проход, без ветвлений на каждую точку.
+
+    :param length: Длина исходного контейнера
+    :type length: Number
+    :param width: Ширина исходного контейнера
+    :type width: Number
+    :param height: Толщина исходного контейнера
+    :type height: Number
+    :param roll_height: Толщина проката, целевая толщина
+    :type roll_height: Number
+    :param xs: Координаты точек по оси X
+    :type xs: np.ndarray
+    :param ys: Координаты точек по оси Y
+    :type ys: np.ndarray
+    :raises ValueError: При отрицательных значениях координат
+    :raises ValueError: При выходе точек за границы области
+    :raises ValueError: При выходе точек за границы области
+                        в криволинейной части
+    :return: Доступные расстояния по обеим осям
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+
+    if np.any(xs < 0):
+        raise ValueError('Значение x должно быть >= 0')
+    if np.any(ys < 0):
+        raise ValueError('Значение y должно быть >= 0')
+
+    max_length = length * height / roll_height
+    max_width = width * height / roll_height
+
+    if np.any((xs > max_width) | (ys > max_length)):
+        raise ValueError(
+            'Ошибка оценки расстояний. Точки выходят за '
+            f'допустимые границы {(max_length, max_width)}'
+        )
+
+    # бит 0 - точка правее контейнера, бит 1 - выше
+    region = (xs > width).astype(np.int8) | ((ys > length).astype(np.int8) << 1)
+    conditions = [region == 0, region == 1, region == 2, region == 3]
+
+    # выражения областей считаются для всех точек, поэтому деления
+    # на нулевые координаты в чужих областях подавляются
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_curved = width * (length * height / ys) / roll_height
+        y_curved = length * (width * height / xs) / roll_height
+
+    x_estimate = np.select(
+        conditions, [max_width, max_width, x_curved, x_curved]
+    ) - xs
+    y_estimate = np.select(
+        conditions, [max_length, y_curved, max_length, y_curved]
+    ) - ys
+
+    if np.any((x_estimate < 0) | (y_estimate < 0)):
+        raise ValueError(
+            'Ошибка оценки расстояний. Точки выходят за '
+            'допустимые границы криволинейной области'
+        )
+
+    return x_estimate, y_estimate
@@ -14,13 +14,12 @@
 - https://www.sciencedirect.com/science/article/pii/S0020019015001519?via%3Dihub
 """
 
-import math
-import sys
-
 from collections import deque
-from operator import attrgetter
 from typing import Literal, TypeAlias
 
+import numpy as np
+from numba import njit
+
 from .base import Rectangle
 from .types import Number, Point, RectangleProtocol, SoftType
 
@@ -59,33 +58,195 @@ def sort(rectangles: RectList,
     :raises ValueError: В случае, если аргумент `sorting` имеет значение,
                         отличное от указанных, вызывается исключение.
     """
-    if sorting not in ('width', 'length', 'max', 'min', 'area', 'diagonal'):
-        raise ValueError('The algorithm only supports sorting by width '
-                         f'or length but {sorting} was given.')
+    # ключи извлекаются один раз, сравнения выполняются в C
+    number = len(rectangles)
+    lengths = np.fromiter(
+        (rect.length for rect in rectangles), dtype=np.float64, count=number
+    )
+    widths = np.fromiter(
+        (rect.width for rect in rectangles), dtype=np.float64, count=number
+    )
+    sorted_indices = _argsort_indices(lengths, widths, sorting)
+    sorted_rect = [rectangles[i] for i in sorted_indices]
 
-    key_func=None
-    if sorting in ('width', 'length', 'area'):
-        # key_func = attrgetter(sorting)
-        key_func = lambda index: attrgetter(sorting)(rectangles[index])
+    return sorted_rect, sorted_indices
+
+
+def _argsort_indices(lengths: 'np.ndarray', widths: 'np.ndarray',
+                     sorting: SortAttr) -> list[int]:
+    """Индексы по невозрастанию ключа сортировки по массивам сторон
+
+    :param lengths: Массив длин прямоугольников
+    :type lengths: np.ndarray
+    :param widths: Массив ширин прямоугольников
+    :type widths: np.ndarray
+    :param sorting: Параметр сортировки, см. :func:`sort`
+    :type sorting: SortAttr
+    :return: Список индексов в отсортированном порядке
+    :rtype: list[int]
+    :raises ValueError: В случае, если аргумент `sorting` имеет значение,
+                        отличное от указанных, вызывается исключение.
+    """
+    if sorting == 'width':
+        key = widths
+    elif sorting == 'length':
+        key = lengths
+    elif sorting == 'area':
+        key = lengths * widths
     elif sorting == 'diagonal':
-        key_func = lambda index: math.sqrt(
-            rectangles[index].length ** 2 + rectangles[index].width ** 2
-        )
+        # квадрат диагонали упорядочивает так же, как сама диагональ
+        key = lengths * lengths + widths * widths
     elif sorting == 'max':
-        key_func = lambda index: max(
-            rectangles[index].length, rectangles[index].width
-        )
+        key = np.maximum(lengths, widths)
+    elif sorting == 'min':
+        key = np.minimum(lengths, widths)
     else:
-        key_func = lambda index: min(
-            rectangles[index].length, rectangles[index].width
-        )
+        raise ValueError('The algorithm only supports sorting by width '
+                         f'or length but {sorting} was given.')
 
-    sorted_indices = sorted(
-        range(len(rectangles)), key=key_func, reverse=True
-    )
-    sorted_rect = [rectangles[i] for i in sorted_indices]
+    return np.argsort(-key, kind='stable').tolist()
 
-    return sorted_rect, sorted_indices
+
+@njit(cache=True)
+def _best_fig_hard_jit(order, alive, lengths, widths, rotatable,
+                       length, width):
+    """Ядро выбора лучшей фигуры без мягких размеров
+
+    Специализация :func:`_best_fig_jit` для `soft_type is None`:
+    в лестнице остаются только приоритеты 1-4 и 10, проверки мягких
+    границ не выполняются вовсе.
+    """
+    priority, orientation, best = 11, -1, -1
+    capacity = length * width
+    for k in range(order.shape[0]):
+        i = order[k]
+        if not alive[i]:
+            continue
+        size_l = lengths[i]
+        size_w = widths[i]
+        if size_l * size_w > capacity:
+            continue
+        # у квадрата обе ориентации совпадают, достаточно одной
+        variants = 2 if rotatable[i] and size_l != size_w else 1
+        for j in range(variants):
+            if j == 1:
+                rect_l, rect_w = size_w, size_l
+            else:
+                rect_l, rect_w = size_l, size_w
+            if priority > 1 and rect_l == length and rect_w == width:
+                priority, orientation, best = 1, j, i
+                break
+            elif priority > 2 and rect_l < length and rect_w == width:
+                priority, orientation, best = 2, j, i
+            elif priority > 3 and rect_l == length and rect_w < width:
+                priority, orientation, best = 3, j, i
+            elif priority >= 4 and rect_l < length and rect_w < width:
+                if priority == 4 and j == 1 and best == i:
+                    orientation = j
+                if priority > 4:
+                    priority, orientation, best = 4, j, i
+            elif priority > 10:
+                priority, orientation, best = 10, j, i
+        if priority == 1:
+            break
+    return priority, orientation, best
+
+
+@njit(cache=True)
+def _best_fig_jit(order, alive, lengths, widths, rotatable,
+                  length, width, max_length, max_width, soft):
+    """Ядро выбора лучшей фигуры по массивам сторон
+
+    Повторяет лестницу приоритетов :func:`get_best_fig` в виде
+    числового цикла, компилируемого numba. Отсутствие мягких размеров
+    кодируется значением `soft=0`, отсутствие результата - индексом -1.
+    """
+    priority, orientation, best = 11, -1, -1
+    capacity = max_length * max_width
+    for k in range(order.shape[0]):
+        i = order[k]
+        if not alive[i]:
+            continue
+        size_l = lengths[i]
+        size_w = widths[i]
+        if size_l * size_w > capacity:
+            continue
+        # у квадрата обе ориентации совпадают, достаточно одной
+        variants = 2 if rotatable[i] and size_l != size_w else 1
+        for j in range(variants):
+            if j == 1:
+                rect_l, rect_w = size_w, size_l
+            else:
+                rect_l, rect_w = size_l, size_w
+            if priority > 1 and rect_l == length and rect_w == width:
+                priority, orientation, best = 1, j, i
+                break
+            elif priority > 2 and rect_l < length and rect_w == width:
+                priority, orientation, best = 2, j, i
+            elif priority > 3 and rect_l == length and rect_w < width:
+                priority, orientation, best = 3, j, i
+            elif priority >= 4 and rect_l < length and rect_w < width:
+                if priority == 4 and j == 1 and best == i:
+                    orientation = j
+                if priority > 4:
+                    priority, orientation, best = 4, j, i
+            elif priority > 5 and soft != 0 and rect_l <= max_length and rect_w == width:
+                priority, orientation, best = 5, j, i
+            elif priority > 6 and soft != 0 and rect_l == length and rect_w <= max_width:
+                priority, orientation, best = 6, j, i
+            elif priority > 7 and soft != 0 and rect_l <= max_length and rect_w < width:
+                priority, orientation, best = 7, j, i
+            elif priority > 8 and soft != 0 and rect_l < length and rect_w <= max_width:
+                priority, orientation, best = 8, j, i
+            elif priority > 9 and soft != 0 and rect_l <= max_length and rect_w <= max_width:
+                priority, orientation, best = 9, j, i
+            elif priority > 10:
+                priority, orientation, best = 10, j, i
+        if priority == 1:
+            break
+    return priority, orientation, best
+
+
+def _soft_factors(soft_type: None | SoftType,
+                  excess: Number) -> tuple[Number, Number]:
+    """Коэффициенты превышения размеров по длине и ширине
+
+    Зависят только от `soft_type` и `excess`, поэтому вычисляются один
+    раз на упаковку, а не в каждом вызове :func:`_best_fig`.
+
+    :return: Множители максимальной длины и ширины
+    :rtype: tuple[Number, Number]
+    """
+    length_factor = 1 + excess if soft_type in (1, 3) and excess > 0 else 1
+    width_factor = 1 + excess if soft_type in (2, 3) and excess > 0 else 1
+    return length_factor, width_factor
+
+
+def _best_fig(length: Number, width: Number, order: 'np.ndarray',
+              alive: 'np.ndarray', lengths: 'np.ndarray',
+              widths: 'np.ndarray', rotatable: 'np.ndarray',
+              soft_type: None | SoftType, length_factor: Number,
+              width_factor: Number) -> tuple[int, int | None, int | None]:
+    """Обертка ядра :func:`_best_fig_jit` с семантикой :func:`get_best_fig`
+
+    :return: Приоритет, ориентация и индекс лучшей фигуры
+    :rtype: tuple[int, int | None, int | None]
+    """
+    if soft_type is None:
+        priority, orientation, best = _best_fig_hard_jit(
+            order, alive, lengths, widths, rotatable,
+            float(length), float(width)
+        )
+    else:
+        priority, orientation, best = _best_fig_jit(
+            order, alive, lengths, widths, rotatable,
+            float(length), float(width),
+            float(length * length_factor), float(width * width_factor),
+            soft_type
+        )
+    if best < 0:
+        return priority, None, None
+    return priority, orientation, best
 
 
 def ph_bpp(length: Number, width: Number, rectangles: RectList,
@@ -115,51 +276,106 @@ def ph_bpp(length: Number, width: Number, rectangles: RectList,
     :rtype: list[Rectangle]
     """
     bin_area = length * width
-    for rect in rectangles:
+    # один проход: нормализация ориентации и извлечение параметров
+    number = len(rectangles)
+    lengths = np.empty(number, dtype=np.float64)
+    widths = np.empty(number, dtype=np.float64)
+    rotatable = np.empty(number, dtype=np.bool_)
+    for i, rect in enumerate(rectangles):
         if rect.width > rect.length:
             rect.length, rect.width = rect.width, rect.length
+        lengths[i] = rect.length
+        widths[i] = rect.width
+        rotatable[i] = rect.is_rotatable
 
     if sorting is None:
         # sorted_indices = list(range(len(rectangles)))
-        sorted_indices = []
-        for i, item in enumerate(rectangles):
-            if item.length * item.width <= bin_area:
-                sorted_indices.append(i)
+        sorted_indices = np.flatnonzero(lengths * widths <= bin_area).tolist()
     else:
-        _, sorted_indices = sort(rectangles, sorting=sorting)
+        sorted_indices = _argsort_indices(lengths, widths, sorting)
+
+    # после нормализации меньшая сторона - всегда ширина
+    min_side = widths
 
     result = packing(
         *start, length, width, rectangles, sorted_indices,
-        soft_type=soft_type, excess=excess
+        soft_type=soft_type, excess=excess, min_side=min_side,
+        sides=(lengths, widths, rotatable)
     )
 
     return result
 
 
+def _extract_sides(
+    rectangles: RectList
+) -> tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+    """Массивы длин, ширин и признаков поворота набора прямоугольников
+
+    :param rectangles: Список прямоугольников
+    :type rectangles: RectList
+    :return: Массивы длин, ширин и признаков поворота
+    :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+    """
+    number = len(rectangles)
+    lengths = np.empty(number, dtype=np.float64)
+    widths = np.empty(number, dtype=np.float64)
+    rotatable = np.empty(number, dtype=np.bool_)
+    for i, rect in enumerate(rectangles):
+        lengths[i] = rect.length
+        widths[i] = rect.width
+        rotatable[i] = rect.is_rotatable
+    return lengths, widths, rotatable
+
+
 def packing(x: Number, y: Number, length: Number, width: Number,
             rectangles: RectList, indices: list[int],
-            soft_type: None | SoftType=None,
-            excess: Number=0) -> list[tuple[int, Rectangle]]:
+            soft_type: None | SoftType=None, excess: Number=0,
+            min_side: 'np.ndarray | None'=None,
+            sides: tuple | None=None) -> list[tuple[int, Rectangle]]:
+    if sides is None:
+        sides = _extract_sides(rectangles)
+    lengths, widths, rotatable = sides
+    if min_side is None:
+        min_side = np.minimum(lengths, widths)
+    # маска оставшихся индексов: снятие флага вместо O(N) удаления
+    alive = np.zeros(len(rectangles), dtype=bool)
+    alive[indices] = True
+    # битовая маска оставшихся: проверка пустоты, снятие индекса и
+    # хеширование за O(1) на одном целом числе
+    mask = 0
+    for i in indices:
+        mask |= 1 << i
+    order = np.asarray(indices, dtype=np.int64)
     result = []
+    length_factor, width_factor = _soft_factors(soft_type, excess)
+    # кеш выбора лучшей фигуры на время одной упаковки: одинаковые
+    # подобласти с одинаковым остатком встречаются многократно
+    cache: dict = {}
     regions = deque([(x, y, length, width)])
 
-    while regions:
+    while regions and mask:
         region = regions.popleft()
         r_x, r_y, region_l, region_w = region
-        priority, orientation, best = get_best_fig(
-            region_l, region_w, rectangles, indices,
-            soft_type=soft_type, excess=excess
-        )
+        key = (region_l, region_w, mask, soft_type)
+        found = cache.get(key)
+        if found is None:
+            found = _best_fig(
+                region_l, region_w, order, alive, lengths, widths, rotatable,
+                soft_type, length_factor, width_factor
+            )
+            cache[key] = found
+        priority, orientation, best = found
 
         if priority < 10 and best is not None:
             if orientation == 0:
-                omega, d = rectangles[best].width, rectangles[best].length
+                omega, d = widths[best].item(), lengths[best].item()
             else:
-                omega, d = rectangles[best].length, rectangles[best].width
+                omega, d = lengths[best].item(), widths[best].item()
             result.append(
                 (best, Rectangle(d, omega, (r_x, r_y), name=str(best)))
             )
-            indices.remove(best)
+            alive[best] = False
+            mask &= ~(1 << best)
 
             new_x, new_y = r_x + omega, r_y + d
             if priority == 2:
@@ -167,14 +383,11 @@ def packing(x: Number, y: Number, length: Number, width: Number,
             elif priority == 3:
                 regions.appendleft((new_x, r_y, region_l, region_w - omega))
             elif priority == 4:
-                if not indices:
-                    min_l = min_w = sys.maxsize
-                else:
-                    min_l = min(rectangles[i].length for i in indices)
-                    min_w = min(rectangles[i].width for i in indices)
-                    # Because we can rotate:
-                    min_w = min(min_l, min_w)
-                    min_l = min_w
+                if not mask:
+                    # упаковывать больше нечего, подобласти не нужны
+                    continue
+                # Because we can rotate: наименьшая сторона из оставшихся
+                min_l = min_w = min_side[alive].min()
                 if region_w - omega < min_w:
                     regions.appendleft((r_x, new_y, region_l - d, region_w))
                 elif region_l - d < min_l:
@@ -198,8 +411,16 @@ def packing(x: Number, y: Number, length: Number, width: Number,
 def recursive_packing(x: Number, y: Number, length: Number, width: Number,
                       rectangles: RectList, indices: list[int],
                       result: list[tuple[int, Rectangle]],
-                      soft_type: None | SoftType=None, excess: Number=0):
-    """Рекурсивная процедура для приоритетной эвристики
+                      soft_type: None | SoftType=None, excess: Number=0,
+                      min_side: 'np.ndarray | None'=None,
+                      alive: 'np.ndarray | None'=None,
+                      sides: tuple | None=None):
+    """Процедура упаковки подобластей для приоритетной эвристики
+
+    Подобласти обходятся в том же порядке, что и при рекурсивной
+    реализации, но через явный стек: без накладных расходов на кадры
+    вызовов и без ограничения глубины рекурсии. Мягкие размеры
+    действуют только для исходной области.
 
     :param x: Координата x на плоскости
     :type x: Number
@@ -221,77 +442,94 @@ def recursive_packing(x: Number, y: Number, length: Number, width: Number,
     :param excess: Степень превышения размеров,
                    см. :func:`get_best_fig`, defaults to 0
     :type excess: Number, optional
+    :param min_side: Массив минимальных сторон прямоугольников,
+                     вычисляется при отсутствии, defaults to None
+    :type min_side: np.ndarray, optional
+    :param alive: Маска оставшихся индексов, вычисляется при
+                  отсутствии, defaults to None
+    :type alive: np.ndarray, optional
+    :param sides: Массивы длин, ширин и признаков поворота, вычисляются
+                  при отсутствии, defaults to None
+    :type sides: tuple, optional
     """
-    priority, orientation, best = get_best_fig(
-        length, width, rectangles, indices, soft_type=soft_type, excess=excess
-    )
+    if sides is None:
+        sides = _extract_sides(rectangles)
+    lengths, widths, rotatable = sides
+    if min_side is None:
+        min_side = np.minimum(lengths, widths)
+    if alive is None:
+        alive = np.zeros(len(rectangles), dtype=bool)
+        alive[indices] = True
+    order = np.asarray(indices, dtype=np.int64)
+    # стек подобластей; последний добавленный обрабатывается первым,
+    # поэтому пары областей кладутся в обратном порядке
+    # битовая маска оставшихся: проверка пустоты, снятие индекса и
+    # хеширование за O(1) на одном целом числе
+    mask = 0
+    for i in np.flatnonzero(alive):
+        mask |= 1 << int(i)
+    factors = _soft_factors(soft_type, excess)
+    # кеш выбора лучшей фигуры на время одной упаковки
+    cache: dict = {}
+    stack = [(x, y, length, width, soft_type, factors)]
+
+    while stack and mask:
+        x, y, length, width, soft_type, factors = stack.pop()
+        length_factor, width_factor = factors
+        key = (length, width, mask, soft_type)
+        found = cache.get(key)
+        if found is None:
+            found = _best_fig(
+                length, width, order, alive, lengths, widths, rotatable,
+                soft_type, length_factor, width_factor
+            )
+            cache[key] = found
+        priority, orientation, best = found
 
-    if priority < 10 and best is not None:
+        if priority >= 10 or best is None:
+            continue
         if orientation == 0:
-            omega, d = rectangles[best].width, rectangles[best].length
+            omega, d = widths[best].item(), lengths[best].item()
         else:
-            omega, d = rectangles[best].length, rectangles[best].width
+            omega, d = lengths[best].item(), widths[best].item()
         result.append((best, Rectangle(d, omega, (x, y), name=str(best))))
-        indices.remove(best)
+        alive[best] = False
+        mask &= ~(1 << best)
 
         new_length, new_width = length - d, width - omega
         new_x, new_y = x + omega, y + d
         if priority == 2:
-            recursive_packing(
-                x, new_y, new_length, width, rectangles, indices, result
-            )
+            stack.append((x, new_y, new_length, width, None, (1, 1)))
         elif priority == 3:
-            recursive_packing(
-                new_x, y, length, new_width, rectangles, indices, result
-            )
+            stack.append((new_x, y, length, new_width, None, (1, 1)))
         elif priority == 4:
-            if not indices:
-                min_l = min_w = sys.maxsize
-            else:
-                min_l = min(rectangles[i].length for i in indices)
-                min_w = min(rectangles[i].width for i in indices)
-                # Because we can rotate:
-                min_w = min(min_l, min_w)
-                min_l = min_w
+            if not mask:
+                # упаковывать больше нечего, подобласти не нужны
+                continue
+            # Because we can rotate: наименьшая сторона из оставшихся
+            min_l = min_w = min_side[alive].min()
             if new_width < min_w:
-                recursive_packing(
-                    x, new_y, new_length, width, rectangles, indices, result
-                )
+                stack.append((x, new_y, new_length, width, None, (1, 1)))
             elif new_length < min_l:
-                recursive_packing(
-                    new_x, y, length, new_width, rectangles, indices, result
-                )
+                stack.append((new_x, y, length, new_width, None, (1, 1)))
             elif d < min_w:
-                recursive_packing(
-                    x, new_y, new_length, omega, rectangles, indices, result
-                )
-                recursive_packing(
-                    new_x, y, length, new_width, rectangles, indices, result
-                )
+                stack.append((new_x, y, length, new_width, None, (1, 1)))
+                stack.append((x, new_y, new_length, omega, None, (1, 1)))
             else:
-                recursive_packing(
-                    new_x, y, d, new_width, rectangles, indices, result
-                )
-                recursive_packing(
-                    x, new_y, new_length, width, rectangles, indices, result
-                )
+                stack.append((x, new_y, new_length, width, None, (1, 1)))
+                stack.append((new_x, y, d, new_width, None, (1, 1)))
         elif priority == 7:
             # для мягких размеров по длине
-            new_length, new_width = d, width - omega
-            recursive_packing(
-                new_x, y, new_length, new_width, rectangles, indices, result
-            )
+            stack.append((new_x, y, d, width - omega, None, (1, 1)))
         elif priority == 8:
             # для мягких размеров по ширине
-            new_length, new_width = length - d, omega
-            recursive_packing(
-                x, new_y, new_length, new_width, rectangles, indices, result
-            )
+            stack.append((x, new_y, length - d, omega, None, (1, 1)))
 
 
 def get_best_fig(length: Number, width: Number, rectangles: RectList,
                  indices: list[int], soft_type: None | SoftType=None,
-                 excess: Number=0) -> tuple[int, int | None, int | None]:
+                 excess: Number=0,
+                 alive: 'np.ndarray | None'=None) -> tuple[int, int | None, int | None]:
     """Выбор лучшей фигуры для размещения
 
     Выбор осуществляется на основе приоритета. Приоритет задается каждой
@@ -332,6 +570,9 @@ def get_best_fig(length: Number, width: Number, rectangles: RectList,
                    коэффициент 1 + `excess` для длины или ширины
                    контейнера, defaults to 0
     :type excess: Number, optional
+    :param alive: Маска оставшихся индексов. Индексы со снятым флагом
+                  пропускаются, defaults to None
+    :type alive: np.ndarray, optional
 
     :return: Приоритет, ориентация (0 - текущая, 1 - повернуть на 90
              радусов), индекс лучшей фигуры.
@@ -345,15 +586,26 @@ def get_best_fig(length: Number, width: Number, rectangles: RectList,
     if soft_type in (2, 3) and excess > 0:
         max_width *= (1 + excess)
 
+    # вместимость области не зависит от кандидата
+    capacity = max_length * max_width
     for i in indices:
-        size = (rectangles[i].length, rectangles[i].width)
-        if size[0] * size[1] > max_length * max_width:
+        if alive is not None and not alive[i]:
+            # уже размещен
+            continue
+        rect = rectangles[i]
+        size_l = rect.length
+        size_w = rect.width
+        if size_l * size_w > capacity:
             continue
-        for j in range(1 + rectangles[i].is_rotatable):
-            rect_w = size[(1 + j) % 2]
-            rect_l = size[(0 + j) % 2]
+        for j in (0, 1) if rect.is_rotatable and size_l != size_w else (0,):
+            if j:
+                rect_l, rect_w = size_w, size_l
+            else:
+                rect_l, rect_w = size_l, size_w
             if priority > 1 and rect_l == length and rect_w == width:
                 priority, orientation, best = 1, j, i
+                # лучший возможный вариант, искать дальше нет смысла
+                break
             elif priority > 2 and rect_l < length and rect_w == width:
                 priority, orientation, best = 2, j, i
             elif priority > 3 and rect_l == length and rect_w < width:
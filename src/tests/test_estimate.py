@@ -5,9 +5,10 @@
     - Voronov Vladimir
 """
 
+import numpy as np
 import pytest
 
-from ..estimate import estimate_size
+from ..estimate import estimate_size, estimate_size_vec
 
 
 @pytest.mark.parametrize(
@@ -54,3 +55,34 @@ def test_side_rectangles(x, y, expected):
 def test_curved_part(x, y, expected):
     """Тесты оценки для точки из криволинейной части"""
     assert estimate_size(10, 6, 3, 1.5, x, y) == expected
+
+
+def test_vectorized_matches_scalar():
+    """Тесты векторной оценки для набора точек из всех областей"""
+    points = [
+        (0, 0), (1, 1), (5, 5), (6, 10),
+        (10, 5), (5, 15), (12, 8), (8, 12), (10, 12),
+    ]
+    xs = np.array([point[0] for point in points], dtype=np.float64)
+    ys = np.array([point[1] for point in points], dtype=np.float64)
+    expected = [estimate_size(10, 6, 3, 1.5, x, y) for x, y in points]
+
+    x_estimate, y_estimate = estimate_size_vec(10, 6, 3, 1.5, xs, ys)
+
+    assert np.allclose(x_estimate, [item[0] for item in expected])
+    assert np.allclose(y_estimate, [item[1] for item in expected])
+
+
+@pytest.mark.parametrize(
+    'xs, ys',
+    [
+        ([-1], [0]),
+        ([0], [-1]),
+        ([13], [0]),
+        ([11], [12]),
+    ]
+)
+def test_vectorized_out_of_bounds(xs, ys):
+    """Тесты векторной оценки для точек вне допустимых границ"""
+    with pytest.raises(ValueError):
+        estimate_size_vec(10, 6, 3, 1.5, np.array(xs), np.array(ys))
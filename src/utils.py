@@ -14,12 +14,14 @@ def timeit(func):
     """
     @wraps(func)
     def inner(*args, **kwargs):
-        start = time.time()
+        # perf_counter монотонен и не зависит от перевода системных часов
+        start = time.perf_counter()
         try:
             return func(*args, **kwargs)
         finally:
-            end = time.time()
-            print(f'\033[31mTime {func.__name__}: {end - start} sec\033[0m')
+            end = time.perf_counter()
+            # без безусловной печати: запись в stdout на каждый вызов
+            # заметно дороже самой функции на мелких задачах
             logging.info(
                 'Время выполнения функции %(name)s: '
                 '%(time).4f сек', {'name': func.__name__, 'time': end - start}
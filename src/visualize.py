@@ -6,10 +6,10 @@
     - Воронов Владимир Сергеевич
 """
 
-from random import uniform
-
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as ptc
+from matplotlib.collections import PatchCollection
 
 
 def patch_rect(axis, point, width, length, **kwargs):
@@ -53,19 +53,21 @@ def visualize(length, width, rectangles, title='', with_label=False):
         axes, (0, 0), width, length,
         color='k', hatch='x', fill=False, ec='k', lw=1
     )
-    for rect in rectangles:
-        # Прямоугольник с заливкой
-        patch_rect(
-            axes, (rect.x, rect.y), rect.width, rect.length,
-            color=(uniform(0.5, 1), uniform(0.5, 1), uniform(0.5, 1)),
-            ec='k', lw=0.5
-        )
-        # Прямоугольник с контуром
-        patch_rect(
-            axes, (rect.x, rect.y), rect.width, rect.length,
-            color='k', fill=False, ec='k', lw=1
+    # все прямоугольники и цвета создаются разом: одна коллекция
+    # вместо пары add_patch на каждый элемент
+    patches = [
+        ptc.Rectangle((rect.x, rect.y), rect.width, rect.length)
+        for rect in rectangles
+    ]
+    colors = np.random.uniform(0.5, 1.0, (len(rectangles), 3))
+    # Прямоугольники с заливкой и контуром
+    axes.add_collection(
+        PatchCollection(
+            patches, facecolors=colors, edgecolors='k', linewidths=1
         )
-        if with_label:
+    )
+    if with_label:
+        for rect in rectangles:
             axes.text(
                 rect.x + 0.5 * rect.width, rect.y + 0.5 * rect.length,
                 rect.name